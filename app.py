@@ -1,7 +1,12 @@
 """Intervals.icu Dashboard — track your running and cycling stats."""
 
+import json
 import os
+import tempfile
+import time
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -12,14 +17,13 @@ load_dotenv()
 
 from src.data_processing import (
     activities_to_dataframe,
-    filter_by_type,
-    format_pace,
+    format_pace_series,
     get_personal_bests,
-    monthly_summary,
-    weekly_summary,
+    period_summaries,
+    split_by_type,
 )
 from src.sample_data import generate_sample_activities
-from src.intervals_client import IntervalsClient
+from src.intervals_client import IntervalsClient, json_loads
 
 # --- Page config ---
 st.set_page_config(
@@ -33,14 +37,55 @@ st.title("🏃‍♂️🚴 Intervals.icu Dashboard")
 
 
 # --- Data loading ---
-@st.cache_data(ttl=300)
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_TTL = 300  # seconds
+
+
+@st.cache_data(ttl=CACHE_TTL)
 def load_intervals_data(athlete_id, api_key, weeks):
-    """Load activities from Intervals.icu API (cached for 5 min)."""
+    """Load activities from Intervals.icu API (cached for 5 min).
+
+    Responses are also written to disk as JSON so a server restart within
+    the TTL doesn't trigger another API fetch. A disk hit starts a fresh
+    in-memory TTL, so data can be up to about twice CACHE_TTL old.
+    """
+    cache_path = CACHE_DIR / f"{athlete_id}_{weeks}.json"
+    try:
+        if time.time() - cache_path.stat().st_mtime < CACHE_TTL:
+            return json_loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError):
+        # Unreadable or corrupt cache file: treat as a miss and try to drop it
+        try:
+            cache_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
     client = IntervalsClient(athlete_id, api_key)
     activities = client.get_recent_activities(weeks=weeks)
+
+    # Write to a temp file and rename so readers never see a partial file;
+    # a failed write must not lose the fetched activities
+    tmp_path = None
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(activities, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
     return activities
 
 
+@st.cache_data(ttl=CACHE_TTL)
+def load_sample_data(weeks):
+    """Generate sample activities (cached for 5 min so reruns see the same data)."""
+    return generate_sample_activities(weeks=weeks)
+
+
 def load_data(weeks: int) -> list[dict]:
     """Load data from Intervals.icu or generate sample data."""
     athlete_id = os.getenv("INTERVALS_ATHLETE_ID")
@@ -49,7 +94,43 @@ def load_data(weeks: int) -> list[dict]:
     if athlete_id and api_key:
         return load_intervals_data(athlete_id, api_key, weeks)
     else:
-        return generate_sample_activities(weeks=weeks)
+        return load_sample_data(weeks)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def build_dataframe(activities):
+    """Convert raw activities to a DataFrame (cached for 5 min)."""
+    return activities_to_dataframe(activities)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_type_groups(df):
+    """Activities partitioned by type (cached)."""
+    return split_by_type(df)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def compute_summaries(df, activity_type):
+    """Weekly, monthly and personal-best summaries for an activity type (cached).
+
+    Summaries carry both km and mile columns, so the unit toggle only picks
+    a column at plot time and never invalidates this cache.
+    """
+    type_groups = split_by_type(df)
+    df_filtered = df if activity_type == "All" else type_groups.get(activity_type, df.iloc[:0])
+    weekly, monthly = period_summaries(df_filtered)
+    return weekly, monthly, get_personal_bests(df, activity_type, type_groups)
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def lowess_trend(x, y):
+    """LOWESS-smoothed values of ``y`` at each ``x`` (cached).
+
+    Uses the same bandwidth as Plotly's ``trendline="lowess"``.
+    """
+    import statsmodels.api as sm
+
+    return sm.nonparametric.lowess(y, x, frac=2 / 3, return_sorted=False)
 
 
 # --- Sidebar ---
@@ -81,17 +162,18 @@ with st.sidebar:
 
 # --- Load and process data ---
 raw_activities = load_data(weeks)
-df = activities_to_dataframe(raw_activities)
+df = build_dataframe(raw_activities)
 
 if df.empty:
     st.warning("No activities found. Try increasing the date range.")
     st.stop()
 
-# Filter by type
+# Partition by type once; every per-type view below indexes into this
+type_groups = cached_type_groups(df)
 if activity_type != "All":
-    df_filtered = filter_by_type(df, activity_type)
+    df_filtered = type_groups.get(activity_type, pd.DataFrame())
 else:
-    df_filtered = df.copy()
+    df_filtered = df
 
 if df_filtered.empty:
     st.warning(f"No {activity_type} activities found in the selected period.")
@@ -121,7 +203,7 @@ col5.metric(f"Avg/{dist_label} per Week", f"{avg_per_week:.1f} {dist_label}")
 st.markdown("---")
 st.subheader("📈 Weekly Mileage")
 
-weekly = weekly_summary(df_filtered)
+weekly, monthly, pbs = compute_summaries(df, activity_type)
 if not weekly.empty:
     weekly_dist_col = f"total_distance_{unit}"
     fig_weekly = px.bar(
@@ -149,8 +231,8 @@ chart_col1, chart_col2 = st.columns(2)
 with chart_col1:
     st.subheader("⏱️ Pace / Speed Trend")
 
-    runs = filter_by_type(df_filtered, "Run") if activity_type in ["All", "Run"] else pd.DataFrame()
-    rides = filter_by_type(df_filtered, "Ride") if activity_type in ["All", "Ride"] else pd.DataFrame()
+    runs = type_groups.get("Run", pd.DataFrame()) if activity_type in ["All", "Run"] else pd.DataFrame()
+    rides = type_groups.get("Ride", pd.DataFrame()) if activity_type in ["All", "Ride"] else pd.DataFrame()
 
     if not runs.empty:
         runs_sorted = runs.sort_values("start_date_local")
@@ -158,11 +240,21 @@ with chart_col1:
             runs_sorted,
             x="start_date_local",
             y="pace_min_per_km",
-            trendline="lowess",
+            render_mode="webgl",
             labels={"start_date_local": "", "pace_min_per_km": "Pace (min/km)"},
             color_discrete_sequence=["#FC4C02"],
             hover_data=["name", "distance_km"],
         )
+        fig_pace.add_scatter(
+            x=runs_sorted["start_date_local"],
+            y=lowess_trend(
+                runs_sorted["start_date_local"].to_numpy(dtype="int64"),
+                runs_sorted["pace_min_per_km"].to_numpy(dtype="float64"),
+            ),
+            mode="lines",
+            line_color="#FC4C02",
+            hoverinfo="skip",
+        )
         fig_pace.update_yaxes(autorange="reversed")  # Lower pace = faster
         fig_pace.update_layout(height=350, showlegend=False)
         st.plotly_chart(fig_pace, width="stretch")
@@ -172,11 +264,21 @@ with chart_col1:
             rides_sorted,
             x="start_date_local",
             y="speed_kmh",
-            trendline="lowess",
+            render_mode="webgl",
             labels={"start_date_local": "", "speed_kmh": "Avg Speed (km/h)"},
             color_discrete_sequence=["#1DB954"],
             hover_data=["name", "distance_km"],
         )
+        fig_speed.add_scatter(
+            x=rides_sorted["start_date_local"],
+            y=lowess_trend(
+                rides_sorted["start_date_local"].to_numpy(dtype="int64"),
+                rides_sorted["speed_kmh"].to_numpy(dtype="float64"),
+            ),
+            mode="lines",
+            line_color="#1DB954",
+            hoverinfo="skip",
+        )
         fig_speed.update_layout(height=350, showlegend=False)
         st.plotly_chart(fig_speed, width="stretch")
     else:
@@ -186,10 +288,7 @@ with chart_col1:
 with chart_col2:
     st.subheader("🏅 Activity Breakdown")
 
-    type_counts = df.groupby("type").agg(
-        count=("id", "count"),
-        distance=("distance_km", "sum"),
-    ).reset_index()
+    type_counts = df["type"].value_counts(sort=False).rename_axis("type").reset_index(name="count")
 
     fig_pie = px.pie(
         type_counts,
@@ -205,16 +304,16 @@ with chart_col2:
 st.markdown("---")
 st.subheader("📅 Monthly Summary")
 
-monthly = monthly_summary(df_filtered)
 if not monthly.empty:
     monthly_dist_col = f"total_distance_{unit}"
     fig_monthly = px.bar(
-        monthly,
+        monthly.assign(month=monthly["month"].dt.to_timestamp()),
         x="month",
         y=monthly_dist_col,
         labels={"month": "Month", monthly_dist_col: f"Distance ({dist_label})"},
         color_discrete_sequence=["#FC4C02"],
     )
+    fig_monthly.update_xaxes(dtick="M1", tickformat="%b %Y")
     fig_monthly.update_layout(height=350, xaxis_title="", showlegend=False)
     st.plotly_chart(fig_monthly, width="stretch")
 
@@ -222,7 +321,6 @@ if not monthly.empty:
 st.markdown("---")
 st.subheader("🏆 Personal Bests")
 
-pbs = get_personal_bests(df, activity_type)
 if pbs:
     pb_cols = st.columns(len(pbs))
     for i, (key, pb) in enumerate(pbs.items()):
@@ -239,30 +337,17 @@ else:
 st.markdown("---")
 st.subheader("📋 Recent Activities")
 
-display_cols = [
-    "name", "type", "start_date_local", dist_col,
-    "moving_time_min", "total_elevation_gain", "pace_min_per_km", "speed_kmh",
-]
-display_df = df_filtered[display_cols].copy().sort_values(
-    "start_date_local", ascending=False
-).head(20)
-
-display_df = display_df.rename(columns={
-    "name": "Name",
-    "type": "Type",
-    "start_date_local": "Date",
-    dist_col: f"Distance ({dist_label})",
-    "moving_time_min": "Time (min)",
-    "total_elevation_gain": "Elevation (m)",
-    "pace_min_per_km": "Pace (min/km)",
-    "speed_kmh": "Speed (km/h)",
+recent = df_filtered.nlargest(20, "start_date_local")
+
+display_df = pd.DataFrame({
+    "Name": recent["name"].to_numpy(),
+    "Type": recent["type"].to_numpy(),
+    "Date": recent["start_date_local"].dt.strftime("%d %b %Y %H:%M").to_numpy(),
+    f"Distance ({dist_label})": np.round(recent[dist_col].to_numpy(dtype="float64"), 1),
+    "Time (min)": recent["moving_time_min"].round().astype("Int64").array,
+    "Elevation (m)": recent["total_elevation_gain"].round().astype("Int64").array,
+    "Pace (min/km)": format_pace_series(recent["pace_min_per_km"]).to_numpy(),
+    "Speed (km/h)": np.round(recent["speed_kmh"].to_numpy(dtype="float64"), 1),
 })
 
-display_df["Date"] = display_df["Date"].dt.strftime("%d %b %Y %H:%M")
-display_df[f"Distance ({dist_label})"] = display_df[f"Distance ({dist_label})"].round(1)
-display_df["Time (min)"] = display_df["Time (min)"].round(0).astype(int)
-display_df["Elevation (m)"] = display_df["Elevation (m)"].round(0).astype(int)
-display_df["Pace (min/km)"] = display_df["Pace (min/km)"].apply(format_pace)
-display_df["Speed (km/h)"] = display_df["Speed (km/h)"].round(1)
-
 st.dataframe(display_df, width="stretch", hide_index=True)
@@ -3,11 +3,40 @@
 Supports both Intervals.icu and sample data formats.
 """
 
-from datetime import datetime
-
+import numpy as np
 import pandas as pd
 
 
+# Intervals.icu field -> common field name used throughout the dashboard
+ICU_RENAMES = {
+    "icu_distance": "distance",  # meters
+    "icu_moving_time": "moving_time",  # seconds
+    "icu_elapsed_time": "elapsed_time",
+    "icu_total_elevation_gain": "total_elevation_gain",
+    "icu_average_watts": "average_watts",
+    "icu_weighted_avg_watts": "weighted_avg_watts",
+}
+
+# Derived column -> (source column, multiplier)
+_UNIT_CONVERSIONS = {
+    "distance_km": ("distance", 1 / 1000),
+    "distance_miles": ("distance", 1 / 1609.34),
+    "elapsed_time_min": ("elapsed_time", 1 / 60),
+    "moving_time_min": ("moving_time", 1 / 60),
+    "elevation_gain_ft": ("total_elevation_gain", 3.28084),
+}
+
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    """Parse ISO 8601 timestamps into naive datetimes.
+
+    Columns that are already datetime64 are returned unchanged.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, format="ISO8601", utc=True, cache=True).dt.tz_convert(None)
+
+
 def activities_to_dataframe(activities: list[dict]) -> pd.DataFrame:
     """Convert raw activities to a clean DataFrame.
 
@@ -18,82 +47,69 @@ def activities_to_dataframe(activities: list[dict]) -> pd.DataFrame:
 
     df = pd.DataFrame(activities)
 
-    # Normalize Intervals.icu field names to common format
-    col_map = {
-        "start_date_local": "start_date_local",
-        "moving_time": "moving_time",
-        "elapsed_time": "elapsed_time",
-        "total_elevation_gain": "total_elevation_gain",
-    }
-    # Intervals.icu uses "icu_distance" (meters) or "distance"
-    if "icu_distance" in df.columns and "distance" not in df.columns:
-        df["distance"] = df["icu_distance"]
-    # Intervals.icu uses "icu_moving_time" (seconds)
-    if "icu_moving_time" in df.columns and "moving_time" not in df.columns:
-        df["moving_time"] = df["icu_moving_time"]
-    # Intervals.icu uses "elapsed_time" or "icu_elapsed_time"
-    if "icu_elapsed_time" in df.columns and "elapsed_time" not in df.columns:
-        df["elapsed_time"] = df["icu_elapsed_time"]
-    # Intervals.icu elevation
-    if "icu_total_elevation_gain" in df.columns and "total_elevation_gain" not in df.columns:
-        df["total_elevation_gain"] = df["icu_total_elevation_gain"]
-    # Intervals.icu power
-    if "icu_average_watts" in df.columns and "average_watts" not in df.columns:
-        df["average_watts"] = df["icu_average_watts"]
-    if "icu_weighted_avg_watts" in df.columns and "weighted_avg_watts" not in df.columns:
-        df["weighted_avg_watts"] = df["icu_weighted_avg_watts"]
+    # Normalize Intervals.icu field names to common format (see ICU_RENAMES),
+    # using an icu_* field only when the plain field is absent
+    columns = set(df.columns)
+    df = df.rename(columns={
+        icu: plain
+        for icu, plain in ICU_RENAMES.items()
+        if icu in columns and plain not in columns
+    })
 
     # Ensure required columns exist with defaults
     for col in ["distance", "moving_time", "elapsed_time", "total_elevation_gain"]:
         if col not in df.columns:
             df[col] = 0
 
-    # Parse dates
+    # Parse dates; when only one of the two is present, share the parsed column
     if "start_date_local" in df.columns:
-        df["start_date_local"] = pd.to_datetime(df["start_date_local"])
+        df["start_date_local"] = _parse_dates(df["start_date_local"])
+        if "start_date" in df.columns:
+            df["start_date"] = _parse_dates(df["start_date"])
+        else:
+            df["start_date"] = df["start_date_local"]
     elif "start_date" in df.columns:
-        df["start_date_local"] = pd.to_datetime(df["start_date"])
-
-    if "start_date" not in df.columns:
-        df["start_date"] = df["start_date_local"]
-    else:
-        df["start_date"] = pd.to_datetime(df["start_date"])
-
-    # Convert units
-    df["distance_km"] = df["distance"] / 1000
-    df["distance_miles"] = df["distance"] / 1609.34
-    df["elapsed_time_min"] = df["elapsed_time"] / 60
-    df["moving_time_min"] = df["moving_time"] / 60
-    df["elevation_gain_ft"] = df["total_elevation_gain"] * 3.28084
-
-    # Pace (min/km) for runs
-    df["pace_min_per_km"] = df.apply(
-        lambda row: (row["moving_time"] / 60) / row["distance_km"]
-        if row["distance_km"] > 0
-        else None,
-        axis=1,
-    )
+        df["start_date"] = _parse_dates(df["start_date"])
+        df["start_date_local"] = df["start_date"]
+
+    # Convert units: one multiply over a (rows x conversions) block
+    sources = [source for source, _ in _UNIT_CONVERSIONS.values()]
+    factors = np.array([factor for _, factor in _UNIT_CONVERSIONS.values()])
+    df[list(_UNIT_CONVERSIONS)] = df[sources].to_numpy(dtype="float64") * factors
+
+    moving_time = df["moving_time"].to_numpy(dtype="float64")
+    distance_km = df["distance_km"].to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Pace (min/km) for runs
+        df["pace_min_per_km"] = np.where(
+            distance_km > 0, (moving_time / 60) / distance_km, np.nan
+        )
+        # Speed (km/h) for rides
+        df["speed_kmh"] = np.where(
+            moving_time > 0, distance_km / (moving_time / 3600), np.nan
+        )
 
-    # Speed (km/h) for rides
-    df["speed_kmh"] = df.apply(
-        lambda row: row["distance_km"] / (row["moving_time"] / 3600)
-        if row["moving_time"] > 0
-        else None,
-        axis=1,
-    )
+    # Week and month groupings (weeks start on Monday)
+    start = df["start_date_local"]
+    weekday = pd.to_timedelta(start.dt.dayofweek, unit="D")
+    df["month"] = start.dt.to_period("M")
+    df["week_start"] = start.dt.normalize() - weekday
+    df["day_of_week"] = start.dt.day_name()
 
-    # Week and month groupings
-    df["week"] = df["start_date_local"].dt.isocalendar().week.astype(int)
-    df["year"] = df["start_date_local"].dt.year
-    df["month"] = df["start_date_local"].dt.to_period("M").astype(str)
-    df["week_start"] = df["start_date_local"].dt.to_period("W").apply(
-        lambda r: r.start_time
-    )
-    df["day_of_week"] = df["start_date_local"].dt.day_name()
+    # Few distinct activity types: categorical codes make filters and
+    # groupbys integer comparisons
+    if "type" in df.columns:
+        df["type"] = df["type"].astype("category")
 
     return df
 
 
+TYPE_GROUPS = {
+    "Ride": ["Ride", "VirtualRide"],
+    "Run": ["Run", "VirtualRun"],
+}
+
+
 def filter_by_type(df: pd.DataFrame, activity_type: str) -> pd.DataFrame:
     """Filter activities by type (Run, Ride, etc.).
 
@@ -101,21 +117,46 @@ def filter_by_type(df: pd.DataFrame, activity_type: str) -> pd.DataFrame:
     - "Ride" includes "Ride" and "VirtualRide"
     - "Run" includes "Run" and "VirtualRun"
     """
-    type_groups = {
-        "Ride": ["Ride", "VirtualRide"],
-        "Run": ["Run", "VirtualRun"],
-    }
-    types = type_groups.get(activity_type, [activity_type])
-    return df[df["type"].isin(types)].copy()
+    types = TYPE_GROUPS.get(activity_type, [activity_type])
+    column = df["type"]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Compare integer category codes rather than the strings
+        categories = column.cat.categories
+        wanted = [categories.get_loc(t) for t in types if t in categories]
+        mask = np.isin(column.cat.codes.to_numpy(), wanted)
+    else:
+        mask = column.isin(types).to_numpy()
+    return df[mask]
 
 
-def weekly_summary(df: pd.DataFrame) -> pd.DataFrame:
-    """Aggregate activities by week."""
-    if df.empty:
-        return pd.DataFrame()
+def split_by_type(df: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Partition activities by type in a single pass.
 
-    weekly = (
-        df.groupby("week_start")
+    Keys match :func:`filter_by_type`, so ``split_by_type(df)["Ride"]``
+    holds the same rows as ``filter_by_type(df, "Ride")``.
+    """
+    if df.empty:
+        return {}
+    group_of = {t: group for group, types in TYPE_GROUPS.items() for t in types}
+    keys = df["type"].astype(object).replace(group_of)
+    return dict(iter(df.groupby(keys, sort=False)))
+
+
+_SUMMARY_COLUMNS = [
+    "id",
+    "distance_km",
+    "distance_miles",
+    "moving_time_min",
+    "total_elevation_gain",
+    "pace_min_per_km",
+    "speed_kmh",
+]
+
+
+def _summarize(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Aggregate the summary columns of ``df`` grouped by ``key``."""
+    return (
+        df.groupby(key, sort=False, observed=True, as_index=False)
         .agg(
             total_distance_km=("distance_km", "sum"),
             total_distance_miles=("distance_miles", "sum"),
@@ -125,151 +166,152 @@ def weekly_summary(df: pd.DataFrame) -> pd.DataFrame:
             avg_pace=("pace_min_per_km", "mean"),
             avg_speed_kmh=("speed_kmh", "mean"),
         )
-        .reset_index()
-        .sort_values("week_start")
+        .sort_values(key, kind="stable", ignore_index=True)
     )
-    return weekly
+
+
+def weekly_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate activities by week."""
+    if df.empty:
+        return pd.DataFrame()
+    return _summarize(df[["week_start", *_SUMMARY_COLUMNS]], "week_start")
 
 
 def monthly_summary(df: pd.DataFrame) -> pd.DataFrame:
     """Aggregate activities by month."""
     if df.empty:
         return pd.DataFrame()
+    return _summarize(df[["month", *_SUMMARY_COLUMNS]], "month")
 
-    monthly = (
-        df.groupby("month")
-        .agg(
-            total_distance_km=("distance_km", "sum"),
-            total_distance_miles=("distance_miles", "sum"),
-            total_moving_time_min=("moving_time_min", "sum"),
-            total_elevation_m=("total_elevation_gain", "sum"),
-            activity_count=("id", "count"),
-            avg_pace=("pace_min_per_km", "mean"),
-            avg_speed_kmh=("speed_kmh", "mean"),
-        )
-        .reset_index()
-        .sort_values("month")
-    )
-    return monthly
+
+def period_summaries(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Aggregate activities by week and by month in one call.
+
+    Projects the summary columns once and groups the same narrow frame
+    by both keys.
+    """
+    if df.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    narrow = df[["week_start", "month", *_SUMMARY_COLUMNS]]
+    return _summarize(narrow, "week_start"), _summarize(narrow, "month")
 
 
 def format_pace(pace_decimal: float) -> str:
     """Convert decimal pace (e.g. 4.5) to mm:ss format (e.g. 4:30)."""
     if pace_decimal is None or pd.isna(pace_decimal):
         return "--:--"
-    minutes = int(pace_decimal)
-    seconds = int((pace_decimal - minutes) * 60)
+    minutes, seconds = divmod(int(round(pace_decimal * 60)), 60)
     return f"{minutes}:{seconds:02d}"
 
 
-def get_personal_bests(df: pd.DataFrame, activity_type: str = "All") -> dict:
-    """Extract personal bests from activities, filtered by activity type."""
-    pbs = {}
+def format_pace_series(paces: pd.Series) -> pd.Series:
+    """Vectorized :func:`format_pace` for a whole Series of decimal paces."""
+    values = paces.to_numpy(dtype="float64")
+    missing = np.isnan(values)
+    total_seconds = np.rint(np.where(missing, 0.0, values) * 60).astype("int64")
+    minutes, seconds = np.divmod(total_seconds, 60)
+    formatted = (
+        pd.Series(minutes, index=paces.index).astype(str)
+        + ":"
+        + pd.Series(seconds, index=paces.index).astype(str).str.zfill(2)
+    )
+    return formatted.mask(missing, "--:--")
+
+
+def _row_at_min(df: pd.DataFrame, col: str) -> pd.Series:
+    """Return the row of ``df`` holding the smallest non-NaN ``col`` value."""
+    return df.iloc[np.nanargmin(df[col].to_numpy(dtype="float64"))]
+
+
+def _row_at_max(df: pd.DataFrame, col: str) -> pd.Series:
+    """Return the row of ``df`` holding the largest non-NaN ``col`` value."""
+    return df.iloc[np.nanargmax(df[col].to_numpy(dtype="float64"))]
+
+
+def get_personal_bests(
+    df: pd.DataFrame,
+    activity_type: str = "All",
+    type_groups: dict[str, pd.DataFrame] | None = None,
+) -> dict:
+    """Extract personal bests from activities, filtered by activity type.
+
+    Pass ``type_groups`` (from :func:`split_by_type`) to reuse an existing
+    partition instead of filtering ``df`` again.
+    """
+    # PB key -> (activity row, formatted value); dates are formatted at the end
+    bests: dict[str, tuple[pd.Series, str]] = {}
 
     show_run = activity_type in ("All", "Run")
     show_ride = activity_type in ("All", "Ride")
 
-    runs = filter_by_type(df, "Run") if show_run else pd.DataFrame()
-    rides = filter_by_type(df, "Ride") if show_ride else pd.DataFrame()
+    if type_groups is None:
+        type_groups = split_by_type(df)
+    runs = type_groups.get("Run", pd.DataFrame()) if show_run else pd.DataFrame()
+    rides = type_groups.get("Ride", pd.DataFrame()) if show_ride else pd.DataFrame()
 
     if not runs.empty:
         # Fastest pace (lowest min/km)
         valid_pace = runs.dropna(subset=["pace_min_per_km"])
         if not valid_pace.empty:
-            fastest_run = valid_pace.loc[valid_pace["pace_min_per_km"].idxmin()]
-            pbs["fastest_pace"] = {
-                "value": format_pace(fastest_run["pace_min_per_km"]),
-                "date": fastest_run["start_date_local"].strftime("%d %b %Y"),
-                "name": fastest_run.get("name", ""),
-            }
+            fastest_run = _row_at_min(valid_pace, "pace_min_per_km")
+            bests["fastest_pace"] = (fastest_run, format_pace(fastest_run["pace_min_per_km"]))
         # Longest run
-        longest_run = runs.loc[runs["distance_km"].idxmax()]
-        pbs["longest_run"] = {
-            "value": f"{longest_run['distance_km']:.1f} km",
-            "date": longest_run["start_date_local"].strftime("%d %b %Y"),
-            "name": longest_run.get("name", ""),
-        }
+        longest_run = _row_at_max(runs, "distance_km")
+        bests["longest_run"] = (longest_run, f"{longest_run['distance_km']:.1f} km")
         # Most climbing
         if "total_elevation_gain" in runs.columns:
-            runs_with_elev = runs.dropna(subset=["total_elevation_gain"])
-            runs_with_elev = runs_with_elev[runs_with_elev["total_elevation_gain"] > 0]
+            # NaN compares False, so the mask also drops missing values
+            runs_with_elev = runs[runs["total_elevation_gain"] > 0]
             if not runs_with_elev.empty:
-                most_climbing = runs_with_elev.loc[runs_with_elev["total_elevation_gain"].idxmax()]
-                pbs["most_climbing"] = {
-                    "value": f"{most_climbing['total_elevation_gain']:.0f} m",
-                    "date": most_climbing["start_date_local"].strftime("%d %b %Y"),
-                    "name": most_climbing.get("name", ""),
-                }
+                most_climbing = _row_at_max(runs_with_elev, "total_elevation_gain")
+                bests["most_climbing"] = (most_climbing, f"{most_climbing['total_elevation_gain']:.0f} m")
         # Longest time (biggest single effort)
-        longest_time = runs.loc[runs["moving_time_min"].idxmax()]
+        longest_time = _row_at_max(runs, "moving_time_min")
         hrs = int(longest_time["moving_time_min"] // 60)
         mins = int(longest_time["moving_time_min"] % 60)
         time_str = f"{hrs}h {mins}m" if hrs > 0 else f"{mins}m"
-        pbs["longest_effort"] = {
-            "value": time_str,
-            "date": longest_time["start_date_local"].strftime("%d %b %Y"),
-            "name": longest_time.get("name", ""),
-        }
+        bests["longest_effort"] = (longest_time, time_str)
         # Best estimated 5K pace (fastest pace on runs >= 5 km)
         if not valid_pace.empty:
             runs_5k = valid_pace[valid_pace["distance_km"] >= 5.0]
             if not runs_5k.empty:
-                best_5k = runs_5k.loc[runs_5k["pace_min_per_km"].idxmin()]
-                pbs["best_5k_pace"] = {
-                    "value": format_pace(best_5k["pace_min_per_km"]),
-                    "date": best_5k["start_date_local"].strftime("%d %b %Y"),
-                    "name": best_5k.get("name", ""),
-                }
+                best_5k = _row_at_min(runs_5k, "pace_min_per_km")
+                bests["best_5k_pace"] = (best_5k, format_pace(best_5k["pace_min_per_km"]))
 
     if not rides.empty:
         # Fastest ride (highest avg speed)
-        fastest_ride = rides.loc[rides["speed_kmh"].idxmax()]
-        pbs["fastest_ride"] = {
-            "value": f"{fastest_ride['speed_kmh']:.1f} km/h",
-            "date": fastest_ride["start_date_local"].strftime("%d %b %Y"),
-            "name": fastest_ride.get("name", ""),
-        }
+        fastest_ride = _row_at_max(rides, "speed_kmh")
+        bests["fastest_ride"] = (fastest_ride, f"{fastest_ride['speed_kmh']:.1f} km/h")
         # Longest ride
-        longest_ride = rides.loc[rides["distance_km"].idxmax()]
-        pbs["longest_ride"] = {
-            "value": f"{longest_ride['distance_km']:.1f} km",
-            "date": longest_ride["start_date_local"].strftime("%d %b %Y"),
-            "name": longest_ride.get("name", ""),
-        }
+        longest_ride = _row_at_max(rides, "distance_km")
+        bests["longest_ride"] = (longest_ride, f"{longest_ride['distance_km']:.1f} km")
         # Most climbing
         if "total_elevation_gain" in rides.columns:
-            rides_with_elev = rides.dropna(subset=["total_elevation_gain"])
-            rides_with_elev = rides_with_elev[rides_with_elev["total_elevation_gain"] > 0]
+            rides_with_elev = rides[rides["total_elevation_gain"] > 0]
             if not rides_with_elev.empty:
-                most_climbing = rides_with_elev.loc[rides_with_elev["total_elevation_gain"].idxmax()]
-                pbs["most_climbing"] = {
-                    "value": f"{most_climbing['total_elevation_gain']:.0f} m",
-                    "date": most_climbing["start_date_local"].strftime("%d %b %Y"),
-                    "name": most_climbing.get("name", ""),
-                }
+                most_climbing = _row_at_max(rides_with_elev, "total_elevation_gain")
+                bests["most_climbing"] = (most_climbing, f"{most_climbing['total_elevation_gain']:.0f} m")
         # Top speed
         if "max_speed" in rides.columns:
-            rides_with_speed = rides.dropna(subset=["max_speed"])
-            rides_with_speed = rides_with_speed[rides_with_speed["max_speed"] > 0]
+            rides_with_speed = rides[rides["max_speed"] > 0]
             if not rides_with_speed.empty:
-                top_speed = rides_with_speed.loc[rides_with_speed["max_speed"].idxmax()]
+                top_speed = _row_at_max(rides_with_speed, "max_speed")
                 # max_speed from API is in m/s, convert to km/h
                 top_speed_kmh = top_speed["max_speed"] * 3.6
-                pbs["top_speed"] = {
-                    "value": f"{top_speed_kmh:.1f} km/h",
-                    "date": top_speed["start_date_local"].strftime("%d %b %Y"),
-                    "name": top_speed.get("name", ""),
-                }
+                bests["top_speed"] = (top_speed, f"{top_speed_kmh:.1f} km/h")
         # Power-based PBs (if power data available)
         if "average_watts" in rides.columns:
-            rides_with_power = rides.dropna(subset=["average_watts"])
-            rides_with_power = rides_with_power[rides_with_power["average_watts"] > 0]
+            rides_with_power = rides[rides["average_watts"] > 0]
             if not rides_with_power.empty:
-                best_power = rides_with_power.loc[rides_with_power["average_watts"].idxmax()]
-                pbs["best_avg_power"] = {
-                    "value": f"{best_power['average_watts']:.0f} W",
-                    "date": best_power["start_date_local"].strftime("%d %b %Y"),
-                    "name": best_power.get("name", ""),
-                }
-
-    return pbs
+                best_power = _row_at_max(rides_with_power, "average_watts")
+                bests["best_avg_power"] = (best_power, f"{best_power['average_watts']:.0f} W")
+
+    if not bests:
+        return {}
+    dates = pd.Series(
+        [row["start_date_local"] for row, _ in bests.values()]
+    ).dt.strftime("%d %b %Y")
+    return {
+        key: {"value": value, "date": date, "name": row.get("name", "")}
+        for (key, (row, value)), date in zip(bests.items(), dates)
+    }
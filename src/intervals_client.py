@@ -4,6 +4,11 @@ from datetime import datetime, timedelta
 
 import requests
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    from json import loads as json_loads
+
 
 class IntervalsClient:
     """Client to interact with the Intervals.icu API.
@@ -26,7 +31,7 @@ class IntervalsClient:
         url = f"{self.BASE_URL}/athlete/{self.athlete_id}{endpoint}"
         response = self.session.get(url, params=params or {}, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     def get_athlete(self) -> dict:
         """Get the authenticated athlete's profile."""
@@ -59,7 +64,7 @@ class IntervalsClient:
         url = f"{self.BASE_URL}/activity/{activity_id}"
         response = self.session.get(url, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     def get_wellness(
         self,
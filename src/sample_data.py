@@ -1,98 +1,119 @@
 """Generate sample/demo data for testing the dashboard without a Strava connection."""
 
-import random
 from datetime import datetime, timedelta
 
-import pandas as pd
+import numpy as np
 
+RUN_NAMES = [
+    "Morning Run", "Easy Run", "Tempo Run", "Long Run",
+    "Recovery Run", "Interval Session", "Park Run",
+    "Marathon Training", "Hill Repeats", "Fartlek"
+]
 
-def generate_sample_activities(weeks: int = 12) -> list[dict]:
-    """Generate realistic sample running and cycling activities."""
-    activities = []
-    activity_id = 1
-    now = datetime.now()
-    start = now - timedelta(weeks=weeks)
-
-    current = start
-    while current < now:
-        # ~4 runs per week
-        for _ in range(random.randint(3, 5)):
-            run_day = current + timedelta(
-                days=random.randint(0, 6),
-                hours=random.randint(6, 18),
-                minutes=random.randint(0, 59),
-            )
-            if run_day > now:
-                break
+RIDE_NAMES = [
+    "Morning Ride", "Lunch Ride", "Evening Ride",
+    "Weekend Ride", "Coffee Ride", "Zwift Session",
+    "Hill Climb", "Group Ride", "Recovery Spin",
+    "Threshold Intervals"
+]
 
-            distance = random.uniform(5000, 21000)  # 5k to half marathon
-            pace_sec_per_km = random.uniform(240, 300)  # 4:00 - 5:00 /km
-            moving_time = (distance / 1000) * pace_sec_per_km
-            elapsed_time = moving_time * random.uniform(1.0, 1.1)
 
-            run_names = [
-                "Morning Run", "Easy Run", "Tempo Run", "Long Run",
-                "Recovery Run", "Interval Session", "Park Run",
-                "Marathon Training", "Hill Repeats", "Fartlek"
-            ]
+def _start_times(
+    rng: np.random.Generator,
+    start: datetime,
+    end: datetime,
+    weeks: int,
+    per_week: tuple[int, int],
+    hours: tuple[int, int],
+) -> list[datetime]:
+    """Random start times before ``end``, ``per_week`` (inclusive range) per week."""
+    counts = rng.integers(per_week[0], per_week[1] + 1, size=weeks)
+    week = np.repeat(np.arange(weeks), counts)
+    n = len(week)
+    days = week * 7 + rng.integers(0, 7, n)
+    minutes = rng.integers(hours[0], hours[1] + 1, n) * 60 + rng.integers(0, 60, n)
+    offsets = days * 1440 + minutes
+    times = [start + timedelta(minutes=int(m)) for m in offsets]
+    return [t for t in times if t <= end]
 
-            activities.append({
-                "id": activity_id,
-                "name": random.choice(run_names),
-                "type": "Run",
-                "start_date": run_day.isoformat() + "Z",
-                "start_date_local": run_day.isoformat() + "Z",
-                "distance": distance,
-                "moving_time": int(moving_time),
-                "elapsed_time": int(elapsed_time),
-                "total_elevation_gain": random.uniform(20, 200),
-                "average_heartrate": random.uniform(140, 170),
-                "max_heartrate": random.uniform(165, 195),
-                "suffer_score": random.randint(30, 150),
-            })
-            activity_id += 1
 
-        # ~2 rides per week
-        for _ in range(random.randint(1, 3)):
-            ride_day = current + timedelta(
-                days=random.randint(0, 6),
-                hours=random.randint(7, 16),
-                minutes=random.randint(0, 59),
-            )
-            if ride_day > now:
-                break
-
-            distance = random.uniform(20000, 100000)  # 20-100km
-            speed_kmh = random.uniform(25, 35)
-            moving_time = (distance / 1000) / speed_kmh * 3600
-            elapsed_time = moving_time * random.uniform(1.0, 1.15)
+def generate_sample_activities(weeks: int = 12) -> list[dict]:
+    """Generate realistic sample running and cycling activities.
 
-            ride_names = [
-                "Morning Ride", "Lunch Ride", "Evening Ride",
-                "Weekend Ride", "Coffee Ride", "Zwift Session",
-                "Hill Climb", "Group Ride", "Recovery Spin",
-                "Threshold Intervals"
-            ]
+    Every random field is drawn for all activities at once with NumPy,
+    then zipped into activity dicts.
+    """
+    rng = np.random.default_rng()
+    now = datetime.now()
+    start = now - timedelta(weeks=weeks)
+    activities = []
 
-            activities.append({
-                "id": activity_id,
-                "name": random.choice(ride_names),
-                "type": "Ride",
-                "start_date": ride_day.isoformat() + "Z",
-                "start_date_local": ride_day.isoformat() + "Z",
-                "distance": distance,
-                "moving_time": int(moving_time),
-                "elapsed_time": int(elapsed_time),
-                "total_elevation_gain": random.uniform(100, 1200),
-                "average_heartrate": random.uniform(130, 160),
-                "max_heartrate": random.uniform(160, 190),
-                "suffer_score": random.randint(40, 200),
-                "average_watts": random.uniform(180, 280),
-            })
-            activity_id += 1
+    # ~4 runs per week
+    run_days = _start_times(rng, start, now, weeks, per_week=(3, 5), hours=(6, 18))
+    n = len(run_days)
+    distance = rng.uniform(5000, 21000, n)  # 5k to half marathon
+    pace_sec_per_km = rng.uniform(240, 300, n)  # 4:00 - 5:00 /km
+    moving_time = (distance / 1000) * pace_sec_per_km
+    elapsed_time = moving_time * rng.uniform(1.0, 1.1, n)
+    for run_day, name, dist, moving, elapsed, elev, avg_hr, max_hr, suffer in zip(
+        run_days,
+        rng.choice(RUN_NAMES, n).tolist(),
+        distance.tolist(),
+        moving_time.astype(int).tolist(),
+        elapsed_time.astype(int).tolist(),
+        rng.uniform(20, 200, n).tolist(),
+        rng.uniform(140, 170, n).tolist(),
+        rng.uniform(165, 195, n).tolist(),
+        rng.integers(30, 151, n).tolist(),
+    ):
+        activities.append({
+            "name": name,
+            "type": "Run",
+            "start_date": run_day.isoformat() + "Z",
+            "start_date_local": run_day.isoformat() + "Z",
+            "distance": dist,
+            "moving_time": moving,
+            "elapsed_time": elapsed,
+            "total_elevation_gain": elev,
+            "average_heartrate": avg_hr,
+            "max_heartrate": max_hr,
+            "suffer_score": suffer,
+        })
 
-        current += timedelta(weeks=1)
+    # ~2 rides per week
+    ride_days = _start_times(rng, start, now, weeks, per_week=(1, 3), hours=(7, 16))
+    n = len(ride_days)
+    distance = rng.uniform(20000, 100000, n)  # 20-100km
+    speed_kmh = rng.uniform(25, 35, n)
+    moving_time = (distance / 1000) / speed_kmh * 3600
+    elapsed_time = moving_time * rng.uniform(1.0, 1.15, n)
+    for ride_day, name, dist, moving, elapsed, elev, avg_hr, max_hr, suffer, watts in zip(
+        ride_days,
+        rng.choice(RIDE_NAMES, n).tolist(),
+        distance.tolist(),
+        moving_time.astype(int).tolist(),
+        elapsed_time.astype(int).tolist(),
+        rng.uniform(100, 1200, n).tolist(),
+        rng.uniform(130, 160, n).tolist(),
+        rng.uniform(160, 190, n).tolist(),
+        rng.integers(40, 201, n).tolist(),
+        rng.uniform(180, 280, n).tolist(),
+    ):
+        activities.append({
+            "name": name,
+            "type": "Ride",
+            "start_date": ride_day.isoformat() + "Z",
+            "start_date_local": ride_day.isoformat() + "Z",
+            "distance": dist,
+            "moving_time": moving,
+            "elapsed_time": elapsed,
+            "total_elevation_gain": elev,
+            "average_heartrate": avg_hr,
+            "max_heartrate": max_hr,
+            "suffer_score": suffer,
+            "average_watts": watts,
+        })
 
-    # Sort by date
+    # Sort by date and number in that order
     activities.sort(key=lambda a: a["start_date"])
-    return activities
+    return [{"id": i, **a} for i, a in enumerate(activities, start=1)]
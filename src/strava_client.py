@@ -1,9 +1,17 @@
 """Strava API client for fetching athlete data and activities."""
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    from json import loads as json_loads
 
 
 class StravaClient:
@@ -18,13 +26,26 @@ class StravaClient:
         self.refresh_token = refresh_token
         self.access_token: str | None = None
         self.token_expires_at: int = 0
+        self.session = requests.Session()
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=10,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False,  # let raise_for_status() report it
+            ),
+        )
+        self.session.mount("https://", adapter)
 
     def _ensure_token(self) -> None:
         """Refresh access token if expired."""
         if self.access_token and time.time() < self.token_expires_at:
             return
 
-        response = requests.post(
+        response = self.session.post(
             self.AUTH_URL,
             data={
                 "client_id": self.client_id,
@@ -35,7 +56,7 @@ class StravaClient:
             timeout=10,
         )
         response.raise_for_status()
-        data = response.json()
+        data = json_loads(response.content)
 
         self.access_token = data["access_token"]
         self.refresh_token = data["refresh_token"]
@@ -44,14 +65,14 @@ class StravaClient:
     def _get(self, endpoint: str, params: dict | None = None) -> dict | list:
         """Make an authenticated GET request to the Strava API."""
         self._ensure_token()
-        response = requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}{endpoint}",
             headers={"Authorization": f"Bearer {self.access_token}"},
             params=params or {},
             timeout=10,
         )
         response.raise_for_status()
-        return response.json()
+        return json_loads(response.content)
 
     def get_athlete(self) -> dict:
         """Get the authenticated athlete's profile."""
@@ -80,19 +101,34 @@ class StravaClient:
         self,
         after: datetime | None = None,
         before: datetime | None = None,
+        max_workers: int = 5,
     ) -> list[dict]:
-        """Fetch all activities, paginating automatically."""
-        all_activities = []
-        page = 1
-        while True:
-            activities = self.get_activities(
-                per_page=200, page=page, after=after, before=before
+        """Fetch all activities, paginating automatically.
+
+        Page 1 is fetched on its own; if it is full, the following pages are
+        requested ``max_workers`` at a time in parallel until a short page
+        marks the end.
+        """
+        per_page = 200
+
+        def fetch(page: int) -> list[dict]:
+            return self.get_activities(
+                per_page=per_page, page=page, after=after, before=before
             )
-            if not activities:
-                break
-            all_activities.extend(activities)
-            page += 1
-        return all_activities
+
+        all_activities = fetch(1)
+        if len(all_activities) < per_page:
+            return all_activities
+
+        page = 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                pages = range(page, page + max_workers)
+                for activities in executor.map(fetch, pages):
+                    all_activities.extend(activities)
+                    if len(activities) < per_page:
+                        return all_activities
+                page += max_workers
 
     def get_recent_activities(self, weeks: int = 12) -> list[dict]:
         """Get activities from the last N weeks."""